@@ -0,0 +1,92 @@
+# app/inference_server.py
+"""
+Internal inference server that owns the models.
+
+Run a single instance next to any number of API workers so each model is
+loaded into memory (and VRAM) once:
+
+    python -m app.inference_server
+    INFERENCE_SERVER_URL=http://127.0.0.1:8001 uvicorn app.main:app --workers 4
+
+Requests from all workers land on this process, where the micro-batcher
+can fuse them into shared forward passes.
+"""
+import os
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, StreamingResponse
+
+from .nlp import (
+    preload_models,
+    stream_summary,
+    stream_translation,
+    summarize_text_async,
+    translate_text_async,
+)
+from .text_utils import (
+    SummarizeRequest,
+    TranslateRequest,
+    add_startup_hooks,
+    sse_events,
+    summary_events,
+)
+
+INFERENCE_HOST = os.environ.get("INFERENCE_HOST", "127.0.0.1")
+INFERENCE_PORT = int(os.environ.get("INFERENCE_PORT", "8001"))
+
+app = FastAPI(
+    title="Local Text AI Inference Server",
+    default_response_class=ORJSONResponse,
+)
+add_startup_hooks(app, preload_models)
+
+
+@app.post("/summarize")
+async def summarize(req: SummarizeRequest):
+    summary = await summarize_text_async(
+        req.text,
+        min_length=req.min_length,
+        max_length=req.max_length,
+        num_beams=req.num_beams,
+        length_penalty=req.length_penalty,
+        early_stopping=req.early_stopping,
+    )
+    return {"summary": summary}
+
+
+@app.post("/translate")
+async def translate(req: TranslateRequest):
+    translation = await translate_text_async(
+        req.text,
+        source_language=req.source_language,
+        target_language=req.target_language,
+    )
+    return {"translation": translation}
+
+
+@app.post("/summarize/stream")
+def summarize_stream(req: SummarizeRequest):
+    pieces = stream_summary(
+        req.text,
+        min_length=req.min_length,
+        max_length=req.max_length,
+        length_penalty=req.length_penalty,
+        early_stopping=req.early_stopping,
+    )
+    return StreamingResponse(summary_events(pieces, req.bullet_points), media_type="text/event-stream")
+
+
+@app.post("/translate/stream")
+def translate_stream(req: TranslateRequest):
+    pieces = stream_translation(
+        req.text,
+        source_language=req.source_language,
+        target_language=req.target_language,
+    )
+    return StreamingResponse(sse_events(pieces), media_type="text/event-stream")
+
+
+if __name__ == "__main__":
+    # One process only: extra workers would each load their own models.
+    uvicorn.run(app, host=INFERENCE_HOST, port=INFERENCE_PORT, workers=1)
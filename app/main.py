@@ -1,17 +1,43 @@
 # app/main.py
-from typing import Literal, Optional
-
-from fastapi import FastAPI, HTTPException
+import logging
+import os
+import threading
+from collections.abc import AsyncIterator
+from typing import Optional
+
+import httpx
+import numpy as np
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from langdetect import detect, LangDetectException
 
-from .nlp import summarize_text, translate_text
+try:
+    import gcld3
+except ImportError:  # fall back to langdetect
+    gcld3 = None
+
+from .text_utils import (
+    SummarizeRequest,
+    TranslateRequest,
+    add_startup_hooks,
+    cache_key,
+    split_bullets,
+    sse_error,
+    sse_events,
+    summary_cache,
+    summary_events,
+    translation_cache,
+)
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="Local Text AI Backend",
     description="Summarization and EN↔AR translation using local Hugging Face models.",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # ---------- CORS so React can talk to backend ----------
@@ -26,17 +52,55 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    expose_headers=["X-Cache"],
+    max_age=86400,  # let browsers cache preflight responses for a day
 )
 # --------------------------------------------------------
 
+# When set, the models live in a separate `python -m app.inference_server`
+# process and this app only handles HTTP, so it can run with --workers N.
+# Otherwise inference runs in-process.
+INFERENCE_SERVER_URL = os.environ.get("INFERENCE_SERVER_URL")
+_inference_client = (
+    httpx.AsyncClient(base_url=INFERENCE_SERVER_URL, timeout=None) if INFERENCE_SERVER_URL else None
+)
 
-class SummarizeRequest(BaseModel):
-    text: str
-    min_length: int = 30
-    max_length: int = 250
-    bullet_points: bool = False
+# Only pull in torch/transformers when the models run in this process.
+if _inference_client is None:
+    from . import nlp
+
+    add_startup_hooks(app, nlp.preload_models)
+else:
+    add_startup_hooks(app)
+
+
+@app.on_event("shutdown")
+async def close_inference_client():
+    if _inference_client is not None:
+        await _inference_client.aclose()
+
+
+async def _post_inference(path: str, payload: dict) -> dict:
+    res = await _inference_client.post(path, json=payload)
+    if res.is_error:
+        raise RuntimeError(f"Inference server returned {res.status_code}: {res.text}")
+    return res.json()
+
+
+async def _proxy_inference_stream(path: str, payload: dict) -> AsyncIterator[bytes | str]:
+    try:
+        async with _inference_client.stream("POST", path, json=payload) as res:
+            if res.is_error:
+                await res.aread()
+                yield sse_error(f"Inference server returned {res.status_code}: {res.text}")
+                return
+            async for chunk in res.aiter_raw():
+                yield chunk
+    except httpx.HTTPError as e:
+        logger.exception("inference stream failed")
+        yield sse_error(str(e))
 
 
 class SummarizeResponse(BaseModel):
@@ -65,12 +129,6 @@ class TextStatsResponse(BaseModel):
     reading_time_seconds: int
 
 
-class TranslateRequest(BaseModel):
-    text: str
-    source_language: Literal["en", "ar"] = "en"
-    target_language: Literal["en", "ar"] = "ar"
-
-
 class TranslateResponse(BaseModel):
     translation: str
 
@@ -81,42 +139,148 @@ def root():
 
 
 @app.post("/summarize", response_model=SummarizeResponse)
-def summarize(req: SummarizeRequest):
+async def summarize(req: SummarizeRequest, response: Response):
     try:
-        summary = summarize_text(
+        key = cache_key(
             req.text,
-            min_length=req.min_length,
-            max_length=req.max_length,
+            req.min_length,
+            req.max_length,
+            req.num_beams,
+            req.length_penalty,
+            req.early_stopping,
         )
+        summary = summary_cache.get(key)
+        response.headers["X-Cache"] = "hit" if summary is not None else "miss"
+
+        if summary is None:
+            if _inference_client is None:
+                summary = await nlp.summarize_text_async(
+                    req.text,
+                    min_length=req.min_length,
+                    max_length=req.max_length,
+                    num_beams=req.num_beams,
+                    length_penalty=req.length_penalty,
+                    early_stopping=req.early_stopping,
+                )
+            else:
+                result = await _post_inference("/summarize", req.model_dump())
+                summary = result["summary"]
+            summary_cache.put(key, summary)
 
         bullet_points_list = None
         if req.bullet_points:
             # Split summary into bullet points by sentences
-            import re
-            sentences = re.split(r'(?<=[.!?])\s+', summary.strip())
-            bullet_points_list = [s.strip() for s in sentences if s.strip()]
+            bullet_points_list = split_bullets(summary)
 
     except Exception as e:
+        logger.exception("summarize failed")
         raise HTTPException(status_code=500, detail=str(e))
 
     return SummarizeResponse(summary=summary, bullet_points=bullet_points_list)
 
 
 @app.post("/translate", response_model=TranslateResponse)
-def translate(req: TranslateRequest):
+async def translate(req: TranslateRequest, response: Response):
     try:
-        translation = translate_text(
-            req.text,
-            source_language=req.source_language,
-            target_language=req.target_language,
-        )
+        key = cache_key(req.text, req.source_language, req.target_language)
+        translation = translation_cache.get(key)
+        response.headers["X-Cache"] = "hit" if translation is not None else "miss"
+
+        if translation is None:
+            if _inference_client is None:
+                translation = await nlp.translate_text_async(
+                    req.text,
+                    source_language=req.source_language,
+                    target_language=req.target_language,
+                )
+            else:
+                result = await _post_inference("/translate", req.model_dump())
+                translation = result["translation"]
+            translation_cache.put(key, translation)
     except Exception as e:
-        print(e)
+        logger.exception("translate failed")
         raise HTTPException(status_code=500, detail=str(e))
 
     return TranslateResponse(translation=translation)
 
 
+@app.post("/summarize/stream")
+def summarize_stream(req: SummarizeRequest):
+    if req.num_beams != 1:
+        raise HTTPException(status_code=400, detail="Streaming only supports num_beams=1")
+
+    if _inference_client is not None:
+        stream = _proxy_inference_stream("/summarize/stream", req.model_dump())
+        return StreamingResponse(stream, media_type="text/event-stream")
+
+    pieces = nlp.stream_summary(
+        req.text,
+        min_length=req.min_length,
+        max_length=req.max_length,
+        length_penalty=req.length_penalty,
+        early_stopping=req.early_stopping,
+    )
+    return StreamingResponse(summary_events(pieces, req.bullet_points), media_type="text/event-stream")
+
+
+@app.post("/translate/stream")
+def translate_stream(req: TranslateRequest):
+    if _inference_client is not None:
+        stream = _proxy_inference_stream("/translate/stream", req.model_dump())
+        return StreamingResponse(stream, media_type="text/event-stream")
+
+    pieces = nlp.stream_translation(
+        req.text,
+        source_language=req.source_language,
+        target_language=req.target_language,
+    )
+    return StreamingResponse(sse_events(pieces), media_type="text/event-stream")
+
+
+# Map language codes to full names
+_LANG_MAP: dict[str, str] = {
+    "en": "English",
+    "ar": "Arabic",
+    "fr": "French",
+    "es": "Spanish",
+    "de": "German",
+    "zh-cn": "Chinese",
+    "zh": "Chinese",
+    "ja": "Japanese",
+    "ko": "Korean",
+    "ru": "Russian",
+    "pt": "Portuguese",
+    "it": "Italian",
+    "nl": "Dutch",
+    "tr": "Turkish",
+    "hi": "Hindi",
+}
+
+# CLD3 is a native model that also reports a real probability; the
+# identifier isn't thread-safe, so calls are serialized.
+_cld3 = gcld3.NNetLanguageIdentifier(min_num_bytes=0, max_num_bytes=1000) if gcld3 else None
+_cld3_lock = threading.Lock()
+
+
+def _detect(text: str) -> tuple[str, str]:
+    """
+    Return (language code, confidence) for text.
+    """
+    if _cld3 is None:
+        detected = detect(text)
+        # Confidence is approximate since langdetect doesn't provide exact confidence
+        confidence = "high" if len(text) > 50 else "medium" if len(text) > 20 else "low"
+        return detected, confidence
+
+    with _cld3_lock:
+        result = _cld3.FindLanguage(text=text)
+    if result.language == "und":
+        raise LangDetectException(0, "No features in text.")
+
+    confidence = "high" if result.probability > 0.9 else "medium" if result.probability > 0.6 else "low"
+    return result.language, confidence
+
+
 @app.post("/detect-language", response_model=DetectLanguageResponse)
 def detect_language(req: DetectLanguageRequest):
     try:
@@ -124,30 +288,9 @@ def detect_language(req: DetectLanguageRequest):
         if not text:
             raise HTTPException(status_code=400, detail="Text cannot be empty")
 
-        detected = detect(text)
+        detected, confidence = _detect(text)
 
-        # Map language codes to full names
-        lang_map = {
-            "en": "English",
-            "ar": "Arabic",
-            "fr": "French",
-            "es": "Spanish",
-            "de": "German",
-            "zh-cn": "Chinese",
-            "ja": "Japanese",
-            "ko": "Korean",
-            "ru": "Russian",
-            "pt": "Portuguese",
-            "it": "Italian",
-            "nl": "Dutch",
-            "tr": "Turkish",
-            "hi": "Hindi",
-        }
-
-        lang_name = lang_map.get(detected, detected.upper())
-
-        # Confidence is approximate since langdetect doesn't provide exact confidence
-        confidence = "high" if len(text) > 50 else "medium" if len(text) > 20 else "low"
+        lang_name = _LANG_MAP.get(detected, detected.upper())
 
     except LangDetectException as e:
         raise HTTPException(status_code=400, detail=f"Could not detect language: {str(e)}")
@@ -157,25 +300,44 @@ def detect_language(req: DetectLanguageRequest):
     return DetectLanguageResponse(language=lang_name, confidence=confidence)
 
 
+# Every code point str.split() treats as whitespace (none are above U+3000).
+_WHITESPACE = np.array([c for c in range(0x3001) if chr(c).isspace()], dtype=np.uint32)
+_SENTENCE_END = np.array([ord(c) for c in ".!?"], dtype=np.uint32)
+_NEWLINE = ord("\n")
+
+
+def _run_starts(mask: np.ndarray) -> np.ndarray:
+    """
+    True where a run of True values begins.
+    """
+    starts = mask.copy()
+    starts[1:] &= ~mask[:-1]
+    return starts
+
+
 @app.post("/stats", response_model=TextStatsResponse)
 def text_stats(req: TextStatsRequest):
-    import re
-
     text = req.text.strip()
 
     # Character count (excluding extra whitespace)
     characters = len(text)
 
-    # Word count
-    words = len(text.split()) if text else 0
+    # One pass over the code points with vectorized masks instead of
+    # separate split()/regex scans.
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    non_space = ~np.isin(codes, _WHITESPACE)
+
+    # Word count (runs of non-whitespace)
+    words = int(np.count_nonzero(_run_starts(non_space)))
 
-    # Sentence count (split by .!?)
-    sentences = len(re.findall(r'[.!?]+', text)) if text else 0
+    # Sentence count (runs of .!?)
+    sentences = int(np.count_nonzero(_run_starts(np.isin(codes, _SENTENCE_END))))
     if sentences == 0 and text:
         sentences = 1  # At least one sentence if there's text
 
-    # Paragraph count (split by double newlines or single newlines)
-    paragraphs = len([p for p in re.split(r'\n\s*\n|\n', text) if p.strip()]) if text else 0
+    # Paragraph count (lines with any non-whitespace on them)
+    line_numbers = np.cumsum(codes == _NEWLINE)[non_space]
+    paragraphs = int(np.count_nonzero(np.diff(line_numbers))) + 1 if line_numbers.size else 0
     if paragraphs == 0 and text:
         paragraphs = 1
 
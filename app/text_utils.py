@@ -0,0 +1,181 @@
+# app/text_utils.py
+"""
+Settings, request models and plain-Python helpers shared by the API and
+the inference server.
+
+Nothing here may import torch or transformers: API workers running
+against a separate inference server import this module without loading
+any model code.
+"""
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from typing import Literal
+
+import anyio.to_thread
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?\u061F])\s+")
+
+
+# ----------------- Settings -----------------
+
+# Comma-separated models to load at startup ("summarizer", "en-ar", "ar-en").
+# Anything not listed is loaded on its first request.
+PRELOAD_MODELS = [
+    name.strip()
+    for name in os.environ.get("PRELOAD_MODELS", "summarizer,en-ar,ar-en").split(",")
+    if name.strip()
+]
+
+# Optional cap, e.g. the number of concurrent generations the GPU can hold.
+# It bounds anyio's threadpool (inference, tokenization, sync endpoints)
+# and, in app.nlp, how many generate() calls run at once, streamed or not.
+# Unset means no limit beyond anyio's default of 40 threads.
+THREAD_LIMIT = int(os.environ["THREAD_LIMIT"]) if os.environ.get("THREAD_LIMIT") else None
+
+
+def add_startup_hooks(app: FastAPI, preload: Callable[[list[str]], None] | None = None) -> None:
+    """
+    Apply THREAD_LIMIT when `app` starts and, if `preload` is given, load
+    the models named in PRELOAD_MODELS with it.
+    """
+
+    @app.on_event("startup")
+    async def limit_threads():
+        if THREAD_LIMIT:
+            anyio.to_thread.current_default_thread_limiter().total_tokens = THREAD_LIMIT
+
+    if preload is not None:
+
+        @app.on_event("startup")
+        def load_models():
+            preload(PRELOAD_MODELS)
+
+
+# ----------------- Request models -----------------
+
+
+class SummarizeRequest(BaseModel):
+    text: str
+    min_length: int = 30
+    max_length: int = 250
+    bullet_points: bool = False
+    # Greedy decoding by default; more beams trade latency for quality.
+    num_beams: int = 1
+    length_penalty: float = 1.0
+    early_stopping: bool = True
+
+
+class TranslateRequest(BaseModel):
+    text: str
+    source_language: Literal["en", "ar"] = "en"
+    target_language: Literal["en", "ar"] = "ar"
+
+
+# ----------------- Result cache -----------------
+
+RESULT_CACHE_SIZE = 1024
+
+
+def cache_key(text: str, *params) -> tuple:
+    """
+    Key a result by a digest of the input text plus the generation params,
+    so cached entries don't hold on to the full input.
+    """
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+    return (digest, *params)
+
+
+class ResultCache:
+    """
+    Bounded LRU of model outputs. Only used from the event loop, so it
+    needs no locking.
+    """
+
+    def __init__(self, maxsize: int = RESULT_CACHE_SIZE):
+        self._maxsize = maxsize
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+
+    def get(self, key: tuple) -> str | None:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: tuple, value: str) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+
+summary_cache = ResultCache()
+translation_cache = ResultCache()
+
+
+# ----------------- Bullet points -----------------
+
+
+def split_bullets(summary: str) -> list[str]:
+    """
+    Split a summary into one bullet point per sentence.
+    """
+    return [s.strip() for s in SENTENCE_SPLIT.split(summary.strip()) if s.strip()]
+
+
+def stream_bullets(pieces: Iterator[str]) -> Iterator[str]:
+    """
+    Regroup streamed text into whole bullet points, yielding each one as
+    soon as the decoder finishes its sentence.
+    """
+    buffer = ""
+    for piece in pieces:
+        buffer += piece
+        *done, buffer = SENTENCE_SPLIT.split(buffer)
+        for sentence in done:
+            if sentence.strip():
+                yield sentence.strip()
+
+    if buffer.strip():
+        yield buffer.strip()
+
+
+# ----------------- Server-Sent Events -----------------
+
+
+def sse_error(detail: str) -> str:
+    """
+    An `error` event carrying `detail`.
+    """
+    return f"event: error\ndata: {json.dumps({'detail': detail})}\n\n"
+
+
+def sse_events(pieces: Iterator[str], field: str = "token") -> Iterator[str]:
+    """
+    Wrap generated text as Server-Sent Events: one `data` event per piece
+    (as `{field: piece}`), then a `done` event, or an `error` event if
+    generation fails.
+    """
+    try:
+        for piece in pieces:
+            yield f"data: {json.dumps({field: piece}, ensure_ascii=False)}\n\n"
+    except Exception as e:
+        yield sse_error(str(e))
+        return
+    yield "event: done\ndata: {}\n\n"
+
+
+def summary_events(pieces: Iterator[str], bullet_points: bool = False) -> Iterator[str]:
+    """
+    SSE for a streamed summary: `token` events, or with `bullet_points`
+    one `bullet` event per finished sentence so the UI can render bullets
+    as they arrive.
+    """
+    if bullet_points:
+        return sse_events(stream_bullets(pieces), field="bullet")
+    return sse_events(pieces)
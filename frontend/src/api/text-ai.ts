@@ -3,6 +3,9 @@ export interface SummarizePayload {
   min_length?: number
   max_length?: number
   bullet_points?: boolean
+  num_beams?: number
+  length_penalty?: number
+  early_stopping?: boolean
 }
 
 export interface SummarizeResult {
@@ -0,0 +1,171 @@
+# tests/test_helpers.py
+"""
+Checks for the plain-Python helpers behind the API. No model is loaded:
+the batcher is driven with a fake `run_batch`.
+
+    python -m pytest tests
+"""
+import asyncio
+import os
+import random
+import re
+
+import pytest
+
+# Import the API in proxy mode so it doesn't pull in torch.
+os.environ.setdefault("INFERENCE_SERVER_URL", "http://127.0.0.1:8001")
+
+from app import main  # noqa: E402
+from app.text_utils import stream_bullets, summary_events  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def nlp():
+    pytest.importorskip("torch")
+    from app import nlp
+
+    return nlp
+
+
+# ----------------- /stats -----------------
+
+
+def regex_stats(text: str) -> dict:
+    """
+    The original regex implementation of /stats, kept as the reference.
+    """
+    text = text.strip()
+    characters = len(text)
+    words = len(text.split()) if text else 0
+    sentences = len(re.findall(r"[.!?]+", text)) if text else 0
+    if sentences == 0 and text:
+        sentences = 1
+    paragraphs = len([p for p in re.split(r"\n\s*\n|\n", text) if p.strip()]) if text else 0
+    if paragraphs == 0 and text:
+        paragraphs = 1
+    reading_time_seconds = int((words / 200) * 60) if words > 0 else 0
+    return {
+        "characters": characters,
+        "words": words,
+        "sentences": sentences,
+        "paragraphs": paragraphs,
+        "reading_time_seconds": reading_time_seconds,
+    }
+
+
+STATS_ALPHABET = list("ab .!?\n\n\t\r\f\v") + [" ", " ", "　", "\x1c", "\x85", " ", "م", "؟"]
+
+
+@pytest.mark.parametrize("text", ["", "   ", "Hello.", "One. Two!\n\nThree?\nFour", "...!!", "مرحبا بكم"])
+def test_stats_matches_regex_examples(text):
+    assert main.text_stats(main.TextStatsRequest(text=text)).model_dump() == regex_stats(text)
+
+
+def test_stats_matches_regex_fuzzed():
+    rng = random.Random(0)
+    for _ in range(5000):
+        text = "".join(rng.choices(STATS_ALPHABET, k=rng.randint(0, 40)))
+        assert main.text_stats(main.TextStatsRequest(text=text)).model_dump() == regex_stats(text), repr(text)
+
+
+# ----------------- Bullet points -----------------
+
+
+def test_stream_bullets_regroups_pieces_into_sentences():
+    pieces = ["The fi", "rst. Sec", "ond one", "! Third?", " Last"]
+    assert list(stream_bullets(iter(pieces))) == ["The first.", "Second one!", "Third?", "Last"]
+
+
+def test_stream_bullets_matches_split_bullets():
+    summary = "Alpha beta.  Gamma!\nDelta؟ Epsilon"
+    pieces = [summary[i : i + 3] for i in range(0, len(summary), 3)]
+    assert list(stream_bullets(iter(pieces))) == main.split_bullets(summary)
+
+
+def test_summary_events_reports_errors():
+    def pieces():
+        yield "Hi. Th"
+        raise RuntimeError("boom")
+
+    events = list(summary_events(pieces(), bullet_points=True))
+    assert events[0] == 'data: {"bullet": "Hi."}\n\n'
+    assert events[-1].startswith("event: error\n")
+
+
+# ----------------- Batching -----------------
+
+
+def test_bucket_by_length_groups_similar_lengths(nlp):
+    lengths = [100, 10, 12, 95, 13, 0, 1]
+    buckets = nlp.bucket_by_length(lengths, max_ratio=1.3)
+
+    assert sorted(i for bucket in buckets for i in bucket) == list(range(len(lengths)))
+    assert buckets == [[5, 6], [1, 2, 4], [3, 0]]
+    for bucket in buckets:
+        assert max(lengths[i] for i in bucket) <= max(lengths[bucket[0]], 1) * 1.3
+
+
+def test_micro_batcher_fuses_requests_and_keeps_order(nlp):
+    calls = []
+
+    def run_batch(chunks, **kwargs):
+        calls.append((list(chunks), kwargs))
+        return [f"{chunk}:{kwargs['tag']}" for chunk in chunks]
+
+    async def scenario():
+        batcher = nlp.MicroBatcher(run_batch, max_batch_size=16, max_delay_ms=20)
+        return await asyncio.gather(
+            batcher.submit(["a", "b"], tag="x"),
+            batcher.submit(["c"], tag="y"),
+            batcher.submit(["d", "e"], tag="x"),
+        )
+
+    assert asyncio.run(scenario()) == [["a:x", "b:x"], ["c:y"], ["d:x", "e:x"]]
+    # One call per kwargs group, each fusing every chunk submitted with them.
+    assert sorted(calls, key=lambda call: call[1]["tag"]) == [
+        (["a", "b", "d", "e"], {"tag": "x"}),
+        (["c"], {"tag": "y"}),
+    ]
+
+
+def test_micro_batcher_buckets_by_length(nlp):
+    calls = []
+
+    def run_batch(chunks):
+        calls.append(list(chunks))
+        return [chunk.upper() for chunk in chunks]
+
+    async def scenario():
+        batcher = nlp.MicroBatcher(run_batch, max_delay_ms=20)
+        return await asyncio.gather(
+            batcher.submit(["long", "short"], lengths=[100, 10]),
+            batcher.submit(["longer"], lengths=[110]),
+        )
+
+    assert asyncio.run(scenario()) == [["LONG", "SHORT"], ["LONGER"]]
+    assert calls == [["short"], ["long", "longer"]]
+
+
+def test_micro_batcher_fails_only_its_group(nlp):
+    def run_batch(chunks, tag):
+        if tag == "bad":
+            raise ValueError("bad batch")
+        return chunks
+
+    async def scenario():
+        batcher = nlp.MicroBatcher(run_batch, max_delay_ms=20)
+        return await asyncio.gather(
+            batcher.submit(["ok"], tag="good"),
+            batcher.submit(["no"], tag="bad"),
+            return_exceptions=True,
+        )
+
+    good, bad = asyncio.run(scenario())
+    assert good == ["ok"]
+    assert isinstance(bad, ValueError)
+
+
+def test_micro_batcher_restarts_on_a_new_event_loop(nlp):
+    batcher = nlp.MicroBatcher(lambda chunks: chunks, max_delay_ms=1)
+    assert asyncio.run(batcher.submit(["first"])) == ["first"]
+    assert asyncio.run(batcher.submit(["second"])) == ["second"]